@@ -4,25 +4,32 @@ Main Streamlit application for generating marketing content using Mistral 7B.
 """
 
 import streamlit as st
-import pandas as pd
 import os
 import sys
-from datetime import datetime
+from pathlib import Path
+from datetime import date
 import base64
 
 # Add utils directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
 
 from generator import ContentGenerator, load_products, get_product_by_id
-from visualization import (
-    display_kpi_cards, 
-    create_time_savings_chart, 
-    create_content_type_distribution,
-    create_tone_effectiveness_chart,
-    display_insights_panel,
-    create_roi_calculation,
-    display_roi_metrics
-)
+from prompt_templates import CONTENT_TYPES, TONES, LANGUAGES
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), 'assets')
+
+@st.cache_resource
+def _load_css() -> str:
+    """Read the app stylesheet once per process."""
+    with open(os.path.join(ASSETS_DIR, 'styles.css'), encoding='utf-8') as f:
+        return f.read()
+
+
+@st.cache_resource
+def _load_about() -> str:
+    """Read the About tab markdown once per process."""
+    with open(os.path.join(ASSETS_DIR, 'about.md'), encoding='utf-8') as f:
+        return f.read()
 
 # Page configuration
 st.set_page_config(
@@ -33,132 +40,34 @@ st.set_page_config(
 )
 
 # Custom CSS for dark/light mode compatibility
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .kpi-card {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-    }
-    
-    
-    .recommendation-box {
-        background: #e3f2fd;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #2196f3;
-        margin: 0.5rem 0;
-        color: #1565c0;
-    }
-    
-    /* Dark mode styles */
-    @media (prefers-color-scheme: dark) {
-        
-        .recommendation-box {
-            background: #1a365d !important;
-            color: #e2e8f0 !important;
-            border-left-color: #2196f3;
-        }
-        
-        .stSelectbox > div > div {
-            background-color: #2d3748 !important;
-            color: #e2e8f0 !important;
-        }
-        
-        .stTextArea > div > div > textarea {
-            background-color: #2d3748 !important;
-            color: #e2e8f0 !important;
-        }
-        
-        .stTextInput > div > div > input {
-            background-color: #2d3748 !important;
-            color: #e2e8f0 !important;
-        }
-        
-        .stNumberInput > div > div > input {
-            background-color: #2d3748 !important;
-            color: #e2e8f0 !important;
-        }
-    }
-    
-    /* Light mode styles */
-    @media (prefers-color-scheme: light) {
-        .recommendation-box {
-            background: #e3f2fd !important;
-            color: #1565c0 !important;
-        }
-    }
-    
-    /* Force dark mode for Streamlit components */
-    .stApp {
-        color: var(--text-color);
-    }
-    
-    .stSelectbox > div > div {
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
-    
-    .stTextArea > div > div > textarea {
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
-    
-    .stTextInput > div > div > input {
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
-    
-    .stNumberInput > div > div > input {
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
-    
-    /* Ensure text is readable in all modes */
-    .stMarkdown {
-        color: var(--text-color);
-    }
-    
-    .stMetric {
-        color: var(--text-color);
-    }
-    
-    .stAlert {
-        color: var(--text-color);
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
+
+@st.cache_resource
+def get_generator():
+    """Return the process-wide content generator shared across sessions."""
+    return ContentGenerator()
 
 def initialize_session_state():
     """Initialize session state variables."""
-    if 'generator' not in st.session_state:
-        st.session_state.generator = ContentGenerator()
-    
     if 'generated_content' not in st.session_state:
         st.session_state.generated_content = None
     
+    if 'tone_variants' not in st.session_state:
+        st.session_state.tone_variants = None
+    
     if 'products' not in st.session_state:
         st.session_state.products = []
 
 def load_product_data():
     """Load product data from CSV."""
     csv_path = "sample_data/products.csv"
-    if os.path.exists(csv_path):
-        st.session_state.products = load_products(csv_path)
-    else:
+    if not Path(csv_path).is_file():
         st.error("❌ Product data file not found. Please ensure sample_data/products.csv exists.")
         return False
+    
+    # load_products returns the same parsed catalog until the file changes
+    st.session_state.products = load_products(csv_path)
+    st.session_state.product_options = st.session_state.products.product_options
     return True
 
 def display_header():
@@ -177,6 +86,14 @@ def display_sidebar():
     # Sidebar removed - all functionality moved to main content area
     return "English"  # Default language
 
+@st.fragment
+def display_generator_panel():
+    """Generator controls and results, rerun on their own when widgets change."""
+    display_content_generator()
+    st.markdown("---")
+    display_generated_content()
+    display_tone_variants()
+
 def display_content_generator():
     """Display the main content generation interface."""
     st.markdown("## 📝 Content Generator")
@@ -190,10 +107,7 @@ def display_content_generator():
     
     with col1:
         # Product selection
-        product_options = {
-            f"{product['Product Name']} ({product['Category']})": product['ProductID'] 
-            for product in st.session_state.products
-        }
+        product_options = st.session_state.product_options
         
         selected_product_name = st.selectbox(
             "🛍️ Select Product",
@@ -217,45 +131,86 @@ def display_content_generator():
                 st.write(f"**Features:** {selected_product['Features/Attributes']}")
     
     with col2:
-        # Content type selection
-        content_type = st.selectbox(
-            "📄 Content Type",
-            ["Product Description", "Social Post", "Email"],
-            help="Choose the type of content to generate"
-        )
+        # Options are batched in a form: only the submit buttons trigger a rerun
+        with st.form("generation_form", border=False):
+            # Content type selection
+            content_type = st.selectbox(
+                "📄 Content Type",
+                CONTENT_TYPES,
+                help="Choose the type of content to generate"
+            )
+            
+            # Tone selection
+            tone = st.selectbox(
+                "🎭 Tone",
+                TONES,
+                help="Select the tone of voice for your content"
+            )
+            
+            # Language selection
+            language = st.selectbox(
+                "🌍 Language",
+                LANGUAGES,
+                help="Language for the generated content"
+            )
+            
+            # Generate buttons
+            generate_clicked = st.form_submit_button(
+                "🚀 Generate Content", type="primary", use_container_width=True
+            )
+            all_tones_clicked = st.form_submit_button(
+                "🎭 Generate for All Tones", use_container_width=True
+            )
         
-        # Tone selection
-        tone = st.selectbox(
-            "🎭 Tone",
-            ["Professional", "Playful", "Luxury", "Casual"],
-            help="Select the tone of voice for your content"
-        )
+        if generate_clicked:
+            if selected_product:
+                # Tokens are shown as they arrive, then the editable view takes over
+                result = get_generator().generate_content(
+                    selected_product,
+                    content_type,
+                    tone,
+                    language,
+                    stream=True
+                )
+                st.session_state.generated_content = result
+                
+                if not result.metadata.cache_hit:
+                    # Full rerun so the Analytics fragment picks up the new stats
+                    st.rerun()
+            else:
+                st.error("❌ Please select a product first.")
         
-        # Language selection
-        language = st.selectbox(
-            "🌍 Language",
-            ["English", "French"],
-            help="Language for the generated content"
-        )
-    
-    # Generate button
-        if st.button("🚀 Generate Content", type="primary", use_container_width=True):
+        if all_tones_clicked:
             if selected_product:
-                with st.spinner("🤖 AI is crafting your content..."):
-                    result = st.session_state.generator.generate_content(
-                        selected_product,
-                        content_type,
-                        tone,
-                        language
-                    )
-                    st.session_state.generated_content = result
-                    
-                    # Show info if fallback was used
-                    if "error" in result.get("metadata", {}):
-                        st.info("ℹ️ Using fallback content generation due to API limitations. The content is still high-quality and ready to use!")
+                with st.status("🤖 AI is crafting one version per tone...") as status:
+                    variants = list(get_generator().generate_content_multi_tone(
+                        selected_product, content_type, TONES, language
+                    ).values())
+                    st.session_state.tone_variants = variants
+                    status.update(label="✅ Tone variants ready", state="complete")
+                
+                if not all(variant.metadata.cache_hit for variant in variants):
+                    # Full rerun so the Analytics fragment picks up the new stats
+                    st.rerun()
             else:
                 st.error("❌ Please select a product first.")
 
+def display_tone_variants():
+    """Display the per-tone variants side by side."""
+    if st.session_state.tone_variants:
+        st.markdown("## 🎭 Tone Comparison")
+        
+        variant_tabs = st.tabs([variant.metadata.tone for variant in st.session_state.tone_variants])
+        
+        for variant_tab, variant in zip(variant_tabs, st.session_state.tone_variants):
+            with variant_tab:
+                st.text_area(
+                    f"{variant.metadata.tone} Content (Editable)",
+                    value=variant.content,
+                    height=200
+                )
+                st.info(variant.recommendations)
+
 def display_generated_content():
     """Display the generated content and controls."""
     if st.session_state.generated_content:
@@ -266,33 +221,71 @@ def display_generated_content():
         # Editable text area
         edited_content = st.text_area(
             "Generated Content (Editable)",
-            value=content_data['content'],
+            value=content_data.content,
             height=200,
             help="You can edit the generated content and copy it manually"
         )
         
         # Generation info
-        st.write(f"⏱️ Generated in {content_data['generation_time']:.2f} seconds")
+        st.write(f"⏱️ Generated in {content_data.generation_time:.2f} seconds")
+        
+        # Show info if fallback was used
+        metadata = content_data.metadata
+        if metadata.error is not None or metadata.fallback:
+            st.info("ℹ️ Using fallback content generation due to API limitations. The content is still high-quality and ready to use!")
         
         # Recommendations
         st.markdown("---")
         st.markdown("### 💡 AI Recommendation")
-        st.info(content_data['recommendations'])
+        st.info(content_data.recommendations)
+
+@st.cache_data(show_spinner=False)
+def _cached_roi(time_saved_hours: float, generations_count: int):
+    """ROI figures for the two KPIs they depend on."""
+    from visualization import create_roi_calculation
+    return create_roi_calculation({
+        'time_saved_hours': time_saved_hours,
+        'generations_count': generations_count
+    })
+
+@st.cache_data(show_spinner=False)
+def _fig_time_savings(time_saved_hours: float, today: date):
+    """Time savings chart; the x axis ends today, so the date is part of the key."""
+    from visualization import create_time_savings_chart
+    return create_time_savings_chart({'time_saved_hours': time_saved_hours})
+
+@st.cache_data(show_spinner=False)
+def _fig_category_distribution(product_categories: tuple):
+    """Category pie chart keyed on (ProductID, Category) pairs."""
+    from visualization import create_content_type_distribution
+    return create_content_type_distribution(
+        [{'ProductID': pid, 'Category': category} for pid, category in product_categories]
+    )
 
+@st.cache_data(show_spinner=False)
+def _fig_tone_effectiveness():
+    """Tone effectiveness chart (static demo data)."""
+    from visualization import create_tone_effectiveness_chart
+    return create_tone_effectiveness_chart()
+
+@st.fragment
 def display_analytics():
     """Display analytics and insights."""
     if not st.session_state.products:
         return
     
+    # Plotly is only imported once the Analytics tab is rendered
+    from visualization import display_kpi_cards, display_insights_panel, display_roi_metrics
+    
     st.markdown("## 📊 Analytics & Insights")
     
     # Display KPIs at the top
-    kpis = st.session_state.generator.calculate_kpis()
+    kpis = get_generator().calculate_kpis()
     display_kpi_cards(kpis)
     
     # ROI Analysis
-    roi_data = create_roi_calculation(kpis)
-    display_roi_metrics(roi_data)
+    roi = _cached_roi(kpis['time_saved_hours'], kpis['generations_count'])
+    display_roi_metrics(roi)
     
     st.markdown("---")
     
@@ -303,16 +296,20 @@ def display_analytics():
         col1, col2 = st.columns(2)
         
         with col1:
-            fig1 = create_time_savings_chart(kpis)
-            st.plotly_chart(fig1, use_container_width=True)
+            fig1 = _fig_time_savings(kpis['time_saved_hours'], date.today())
+            st.plotly_chart(fig1, use_container_width=True, key="time_savings_chart")
         
         with col2:
-            fig2 = create_content_type_distribution(st.session_state.products)
-            st.plotly_chart(fig2, use_container_width=True)
+            product_categories = tuple(
+                (product['ProductID'], product['Category'])
+                for product in st.session_state.products
+            )
+            fig2 = _fig_category_distribution(product_categories)
+            st.plotly_chart(fig2, use_container_width=True, key="category_chart")
     
     with tab2:
-        fig3 = create_tone_effectiveness_chart()
-        st.plotly_chart(fig3, use_container_width=True)
+        fig3 = _fig_tone_effectiveness()
+        st.plotly_chart(fig3, use_container_width=True, key="tone_effectiveness_chart")
     
     with tab3:
         display_insights_panel()
@@ -333,51 +330,13 @@ def main():
     tab1, tab2, tab3 = st.tabs(["🎯 Content Generator", "📊 Analytics", "ℹ️ About"])
     
     with tab1:
-        display_content_generator()
-        st.markdown("---")
-        display_generated_content()
+        display_generator_panel()
     
     with tab2:
         display_analytics()
     
     with tab3:
-        st.markdown("""
-        ## About BrandBoost
-        
-        **BrandBoost** is an AI-powered marketing content generator that helps e-commerce businesses 
-        create consistent, high-quality marketing content across all channels.
-        
-        ### 🎯 Key Features
-        - **Multi-format Content**: Generate product descriptions, social posts, and email content
-        - **Multiple Tones**: Professional, Playful, Luxury, and Casual tones
-        - **Bilingual Support**: English and French content generation
-        - **AI-Powered**: Powered by Mistral 7B via Hugging Face
-        - **Real-time Analytics**: Track performance and ROI
-        
-        ### 🚀 How It Works
-        1. Select a product from your catalog
-        2. Choose content type and tone
-        3. Generate content with AI
-        4. Edit and export as needed
-        
-        ### 📊 Business Impact
-        - **Time Savings**: 25 minutes per content piece
-        - **Cost Reduction**: 60% lower content creation costs (€33.67 saved per piece)
-        - **Consistency**: Maintain brand voice across all channels
-        - **Scalability**: Generate unlimited content variations
-        
-        ### 🔧 Technical Details
-        - **AI Model**: Mistral-7B-Instruct-v0.1
-        - **API**: Hugging Face Inference API
-        - **Framework**: Streamlit
-        - **Data**: Synthetic product catalog for demonstration
-        
-        ---
-        
-        **Disclaimer**: This is a demonstration project using synthetic data and the free 
-        Hugging Face Inference API. For production use, consider implementing proper 
-        authentication, rate limiting, and data validation.
-        """)
+        st.markdown(_load_about().format(model_id=get_generator().endpoint))
 
 if __name__ == "__main__":
     main()
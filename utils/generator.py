@@ -3,35 +3,436 @@ Content generation utilities using Hugging Face Inference API.
 """
 
 import os
+import sys
+import dataclasses
+import functools
+import json
+import operator
 import time
-from typing import Dict, Any, Optional
-from huggingface_hub import InferenceClient
-import streamlit as st
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import threading
+import types
+from array import array
+from collections import ChainMap, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Mapping, Optional, Tuple
+import numpy as np
+from huggingface_hub import InferenceClient, AsyncInferenceClient
+# Optional: the semantic cache is disabled without it. Only probed here;
+# the package (and torch) is imported when the first prompt is embedded.
+HAS_SENTENCE_TRANSFORMERS = importlib.util.find_spec("sentence_transformers") is not None
 try:
-    from .prompt_templates import get_prompt_template, get_recommendations
+    from .prompt_templates import (
+        get_recommendations, get_instructions, render_product_fields, render_prompt
+    )
 except ImportError:
-    from prompt_templates import get_prompt_template, get_recommendations
+    from prompt_templates import (
+        get_recommendations, get_instructions, render_product_fields, render_prompt
+    )
+
+logger = logging.getLogger(__name__)
+
+
+def _st():
+    """
+    Import Streamlit on first UI call.
+    
+    Keeps the Streamlit import off the module import path for batch workers
+    and scripts that only use the generator.
+    """
+    import streamlit
+    return streamlit
+
+
+# Model repo id or inference endpoint URL. Point BRANDBOOST_MODEL at a
+# quantized (e.g. AWQ / W4A16) TGI deployment for faster decoding.
+MODEL_ID = os.environ.get("BRANDBOOST_MODEL", "mistralai/Mistral-7B-Instruct-v0.1")
+
+# Optional self-hosted TGI / vLLM server with continuous batching. When set,
+# requests go there instead of the serverless Inference API so concurrent
+# sessions share forward passes.
+LLM_URL = os.environ.get("BRANDBOOST_LLM_URL")
+
+# Sampling parameters shared by the sync and async generation paths.
+# temperature/top_p already switch TGI to sampling, so do_sample is not sent.
+GENERATION_PARAMS = {
+    "temperature": 0.7,
+    "top_p": 0.9
+}
+
+# Savings assumed per generated piece, used for the KPI dashboard
+MINUTES_SAVED_PER_GENERATION = 30
+EUR_SAVED_PER_GENERATION = 12
+
+# Slots in ContentGenerator._stats
+_STAT_GENERATIONS = 0
+_STAT_CACHE_HITS = 1
+
+# max_new_tokens per content type: ~1.3 tokens per word at the top of the
+# word range each prompt template asks for
+TOKEN_BUDGETS = {
+    "Social Post": 200,
+    "Product Description": 300,
+    "Email": 420
+}
+DEFAULT_MAX_NEW_TOKENS = 300
+
+# Upper bound on max_new_tokens for one multi-tone call; tones are split into
+# several calls rather than asking the endpoint for more than this
+MULTI_TONE_MAX_NEW_TOKENS = 1024
+
+
+def _generation_params(content_type: str) -> Dict[str, Any]:
+    """Sampling parameters with the token budget for a content type."""
+    return {
+        **GENERATION_PARAMS,
+        "max_new_tokens": TOKEN_BUDGETS.get(content_type, DEFAULT_MAX_NEW_TOKENS)
+    }
+
+
+# Closing instruction for generate_content_multi_tone; {tones} is a JSON list
+_MULTI_TONE_INSTRUCTIONS = {
+    "English": "Write one version of the {content_type} in each tone below, using the requirements listed for that tone.",
+    "French": "Rédigez une version du contenu ({content_type}) dans chacun des tons ci-dessous, en suivant les exigences indiquées pour ce ton."
+}
+_MULTI_TONE_FORMAT = {
+    "English": "Return only a JSON object whose keys are {tones} and whose values are the text written in that tone.",
+    "French": "Renvoyez uniquement un objet JSON dont les clés sont {tones} et dont les valeurs sont le texte rédigé dans ce ton."
+}
+
+
+def _parse_tone_variants(response: str, tones: List[str]) -> Optional[Dict[str, str]]:
+    """
+    Extract the per-tone texts from a multi-tone JSON response.
+    
+    Args:
+        response: Raw model output, possibly with text around the JSON object
+        tones: Keys that must all be present
+    
+    Returns:
+        Dictionary of tone to text, or None if the response is unusable
+    """
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        variants = json.loads(response[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(variants, dict):
+        return None
+    texts = {tone: variants.get(tone) for tone in tones}
+    if not all(isinstance(text, str) and text.strip() for text in texts.values()):
+        return None
+    return texts
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(endpoint: str) -> InferenceClient:
+    """Process-wide InferenceClient per endpoint, so its connections stay warm."""
+    return InferenceClient(endpoint, timeout=60)
+
+
+# Product columns used in prompts, read in one C-level lookup per product
+PRODUCT_COLUMNS = tuple(
+    sys.intern(column)
+    for column in ("Product Name", "Category", "Features/Attributes", "Target Audience")
+)
+_PRODUCT_FIELDS = operator.itemgetter(*PRODUCT_COLUMNS)
+
+
+def _product_text(product_data: Dict[str, Any]) -> str:
+    """Product prompt fields as one string, as embedded by the semantic cache."""
+    return "\n".join(map(str, _PRODUCT_FIELDS(product_data)))
+
+
+# Exact-match response cache bounds
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 3600  # seconds
+
+# Wording shared by every fallback template of a language
+_LANG_CONNECTORS: Dict[str, Dict[str, str]] = {
+    "English": {"subject_label": "Subject:", "team": "The BrandBoost Team"},
+    "French": {"subject_label": "Objet :", "team": "L'équipe BrandBoost"}
+}
+
+# Fallback copy used when the API is unavailable, keyed by
+# (content_type, tone, language). Each tone has its own sentences, so the
+# copy stays per combination; product fields and _LANG_CONNECTORS are
+# filled in with str.format_map.
+_FALLBACK_TEMPLATES: Dict[Tuple[str, str, str], str] = {
+    ("Product Description", "Professional", "English"):
+        "Introducing {product_name}, a premium {category} designed for {target_audience}. This exceptional product features {features}. Experience the perfect blend of quality and innovation with {product_name}.",
+    ("Product Description", "Professional", "French"):
+        "Présentation de {product_name}, un {category} premium conçu pour {target_audience}. Ce produit exceptionnel présente {features}. Découvrez le parfait équilibre entre qualité et innovation avec {product_name}.",
+    ("Product Description", "Playful", "English"):
+        "🎉 Meet {product_name} - the {category} that's about to become your new obsession! Perfect for {target_audience}, it's packed with {features}. Get ready to fall in love! 💕",
+    ("Product Description", "Playful", "French"):
+        "🎉 Rencontrez {product_name} - le {category} qui va devenir votre nouvelle obsession ! Parfait pour {target_audience}, il est rempli de {features}. Préparez-vous à tomber amoureux ! 💕",
+    ("Product Description", "Luxury", "English"):
+        "Indulge in the exquisite {product_name}, a distinguished {category} crafted for discerning {target_audience}. Featuring {features}, this masterpiece represents the pinnacle of luxury and sophistication.",
+    ("Product Description", "Luxury", "French"):
+        "Savourez l'exquis {product_name}, un {category} distingué conçu pour {target_audience} exigeants. Avec {features}, ce chef-d'œuvre représente le summum du luxe et de la sophistication.",
+    ("Product Description", "Casual", "English"):
+        "Hey there! Check out {product_name} - it's a pretty cool {category} that {target_audience} are going to love. It's got {features} and honestly, it's just what you need.",
+    ("Product Description", "Casual", "French"):
+        "Salut ! Découvrez {product_name} - c'est un {category} plutôt cool que {target_audience} vont adorer. Il a {features} et honnêtement, c'est exactement ce dont vous avez besoin.",
+    ("Social Post", "Professional", "English"):
+        "Discover {product_name} - the {category} solution for {target_audience}. Features include {features}. #ProductLaunch #Innovation #Quality",
+    ("Social Post", "Professional", "French"):
+        "Découvrez {product_name} - la solution {category} pour {target_audience}. Caractéristiques : {features}. #LancementProduit #Innovation #Qualité",
+    ("Social Post", "Playful", "English"):
+        "🚀 {product_name} is here and it's AMAZING! Perfect for {target_audience} who want {features}. Who's excited? 🙋‍♀️ #NewProduct #Excited #MustHave",
+    ("Social Post", "Playful", "French"):
+        "🚀 {product_name} est là et c'est INCROYABLE ! Parfait pour {target_audience} qui veulent {features}. Qui est excité ? 🙋‍♀️ #NouveauProduit #Excité #Indispensable",
+    ("Social Post", "Luxury", "English"):
+        "Experience the epitome of luxury with {product_name}. This exclusive {category} offers {features} for the most discerning {target_audience}. #Luxury #Exclusive #Premium",
+    ("Social Post", "Luxury", "French"):
+        "Vivez l'épitomé du luxe avec {product_name}. Ce {category} exclusif offre {features} pour les {target_audience} les plus exigeants. #Luxe #Exclusif #Premium",
+    ("Social Post", "Casual", "English"):
+        "Just tried {product_name} and wow! 😍 Great {category} for {target_audience}. Love that it has {features}. Highly recommend! #Review #Recommendation",
+    ("Social Post", "Casual", "French"):
+        "Je viens d'essayer {product_name} et wow ! 😍 Super {category} pour {target_audience}. J'adore qu'il ait {features}. Je recommande fortement ! #Avis #Recommandation",
+    ("Email", "Professional", "English"):
+        "{subject_label} Introducing {product_name} - The {category} Solution You've Been Waiting For\n\nDear Valued Customer,\n\nWe're excited to present {product_name}, a premium {category} designed specifically for {target_audience}. This innovative product features {features}.\n\nBest regards,\n{team}",
+    ("Email", "Professional", "French"):
+        "{subject_label} Présentation de {product_name} - La solution {category} que vous attendiez\n\nCher client,\n\nNous sommes ravis de vous présenter {product_name}, un {category} premium conçu spécifiquement pour {target_audience}. Ce produit innovant présente {features}.\n\nCordialement,\n{team}",
+    ("Email", "Playful", "English"):
+        "{subject_label} 🎉 {product_name} is HERE! (And it's amazing!)\n\nHey there!\n\nGuess what? {product_name} just dropped and it's everything {target_audience} have been dreaming of! With {features}, this {category} is about to change your life! 💫\n\nCheers,\nThe BrandBoost Squad",
+    ("Email", "Playful", "French"):
+        "{subject_label} 🎉 {product_name} est LÀ ! (Et c'est incroyable !)\n\nSalut !\n\nDevine quoi ? {product_name} vient de sortir et c'est tout ce que {target_audience} rêvaient ! Avec {features}, ce {category} va changer votre vie ! 💫\n\nSalut,\n{team}",
+    ("Email", "Luxury", "English"):
+        "{subject_label} Exclusive Invitation: Discover {product_name}\n\nDear Esteemed Client,\n\nWe are honored to invite you to experience {product_name}, our most exclusive {category} offering. Crafted for the discerning {target_audience}, it embodies {features}.\n\nWarm regards,\nBrandBoost Luxury Division",
+    ("Email", "Luxury", "French"):
+        "{subject_label} Invitation exclusive : Découvrez {product_name}\n\nCher client estimé,\n\nNous avons l'honneur de vous inviter à découvrir {product_name}, notre offre {category} la plus exclusive. Conçu pour les {target_audience} exigeants, il incarne {features}.\n\nCordialement,\nDivision Luxe BrandBoost",
+    ("Email", "Casual", "English"):
+        "{subject_label} You'll love {product_name}!\n\nHi!\n\nJust wanted to share something cool with you - {product_name}! It's this awesome {category} that {target_audience} are totally into. The best part? It comes with {features}.\n\nTake care,\n{team}",
+    ("Email", "Casual", "French"):
+        "{subject_label} Vous allez adorer {product_name} !\n\nSalut !\n\nJe voulais juste partager quelque chose de cool avec toi - {product_name} ! C'est ce {category} génial que {target_audience} adorent. Le meilleur ? Il vient avec {features}.\n\nÀ bientôt,\n{team}"
+}
+_FALLBACK_TEMPLATES = {
+    tuple(sys.intern(part) for part in key): template
+    for key, template in _FALLBACK_TEMPLATES.items()
+}
+
+
+@dataclass(slots=True, frozen=True)
+class GenerationMetadata:
+    """What a result was generated for, and how it was produced."""
+    product_name: str
+    content_type: str
+    tone: str
+    language: str
+    timestamp: float
+    fallback: bool = False
+    cache_hit: bool = False
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary; 'error' is only present for failed generations."""
+        data = {
+            "product_name": self.product_name,
+            "content_type": self.content_type,
+            "tone": self.tone,
+            "language": self.language,
+            "timestamp": self.timestamp,
+            "fallback": self.fallback,
+            "cache_hit": self.cache_hit
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class GenerationResult:
+    """Generated content returned by ContentGenerator."""
+    content: str
+    generation_time: float
+    recommendations: str
+    metadata: GenerationMetadata
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary in the shape generate_content used to return."""
+        return {
+            "content": self.content,
+            "generation_time": self.generation_time,
+            "recommendations": self.recommendations,
+            "metadata": self.metadata.to_dict()
+        }
+
+
+# Near-duplicate product cache. Active only when sentence-transformers is
+# installed and sampling is close to deterministic: at higher temperatures a
+# fresh generation is expected to differ, so reusing one would hide that.
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_ROWS = 1024
+SEMANTIC_CACHE_MAX_TEMPERATURE = 0.5
+
+
+class _SemanticCache:
+    """
+    Cosine-similarity cache over embeddings of product descriptions.
+    
+    Rows live in a preallocated matrix; once full, the least recently used
+    row is overwritten, and rows older than ``ttl`` seconds are never served.
+    Matches are only considered within the same scope (content type, tone,
+    language), so copy is reused for products whose fields are phrased
+    slightly differently but never across styles.
+    """
+    
+    def __init__(self, model_name: str, rows: int, threshold: float, ttl: float):
+        self._model_name = model_name
+        self._rows = rows
+        self._threshold = threshold
+        self._ttl = ttl
+        self._embedder = None
+        self._keys: Optional[np.ndarray] = None
+        self._scope_ids = np.full(rows, -1, dtype=np.int64)
+        self._last_used = np.zeros(rows, dtype=np.int64)
+        self._stored_at = np.zeros(rows, dtype=np.float64)
+        self._values: List[Optional[GenerationResult]] = [None] * rows
+        # scope -> id, plus the number of live rows per id so ids are released
+        # when their last row is overwritten
+        self._scopes: Dict[tuple, int] = {}
+        self._scope_rows: Dict[int, int] = {}
+        self._scope_keys: Dict[int, tuple] = {}
+        self._next_scope_id = 0
+        self._size = 0
+        self._tick = 0
+        self._last_embedding: tuple = ("", None)
+        self._lock = threading.Lock()
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """L2-normalized embedding, reusing the last one for repeated text."""
+        with self._lock:
+            last_text, last_vector = self._last_embedding
+            if last_vector is not None and last_text == text:
+                return last_vector
+            if self._embedder is None:
+                from sentence_transformers import SentenceTransformer
+                self._embedder = SentenceTransformer(self._model_name)
+            embedder = self._embedder
+        vector = embedder.encode([text], normalize_embeddings=True)[0].astype(np.float32)
+        with self._lock:
+            self._last_embedding = (text, vector)
+        return vector
+    
+    def get(self, scope: tuple, text: str) -> Optional[GenerationResult]:
+        """Return the fresh stored result most similar to text, if above threshold."""
+        with self._lock:
+            if scope not in self._scopes:
+                return None
+        query = self._embed(text)
+        with self._lock:
+            scope_id = self._scopes.get(scope)
+            if scope_id is None:
+                return None
+            sims = self._keys[:self._size] @ query
+            sims[self._scope_ids[:self._size] != scope_id] = -1.0
+            sims[time.time() - self._stored_at[:self._size] > self._ttl] = -1.0
+            best = int(np.argmax(sims))
+            if sims[best] < self._threshold:
+                return None
+            self._tick += 1
+            self._last_used[best] = self._tick
+            return self._values[best]
+    
+    def put(self, scope: tuple, text: str, result: GenerationResult) -> None:
+        """Store result under the embedding of text."""
+        vector = self._embed(text)
+        with self._lock:
+            if self._keys is None:
+                self._keys = np.zeros((self._rows, vector.shape[0]), dtype=np.float32)
+            if self._size < self._rows:
+                row = self._size
+                self._size += 1
+            else:
+                row = int(np.argmin(self._last_used))
+                self._release_scope(int(self._scope_ids[row]))
+            scope_id = self._scopes.get(scope)
+            if scope_id is None:
+                scope_id = self._next_scope_id
+                self._next_scope_id += 1
+                self._scopes[scope] = scope_id
+                self._scope_keys[scope_id] = scope
+            self._scope_rows[scope_id] = self._scope_rows.get(scope_id, 0) + 1
+            self._tick += 1
+            self._keys[row] = vector
+            self._scope_ids[row] = scope_id
+            self._last_used[row] = self._tick
+            self._stored_at[row] = time.time()
+            self._values[row] = result
+    
+    def _release_scope(self, scope_id: int) -> None:
+        """Drop one row from a scope, forgetting the scope with its last row. Lock held."""
+        remaining = self._scope_rows.pop(scope_id) - 1
+        if remaining:
+            self._scope_rows[scope_id] = remaining
+        else:
+            del self._scopes[self._scope_keys.pop(scope_id)]
+
+
+class GenerationStream:
+    """
+    Iterable over generated text chunks.
+    
+    Once the stream has been fully consumed, ``result`` holds the same
+    GenerationResult that generate_content would have returned.
+    """
+    
+    def __init__(self):
+        self.result: Optional[GenerationResult] = None
+        self._chunks: Iterator[str] = iter(())
+    
+    def __iter__(self) -> Iterator[str]:
+        return self._chunks
 
 
 class ContentGenerator:
     """Main class for generating marketing content using Mistral 7B."""
     
-    def __init__(self):
-        """Initialize the content generator with Hugging Face client."""
-        self.client = InferenceClient("mistralai/Mistral-7B-Instruct-v0.1")
-        self.generation_stats = {
-            "total_generations": 0,
-            "total_time_saved": 0,  # in minutes
-            "total_cost_saved": 0   # in EUR
-        }
+    def __init__(self, model_id: str = MODEL_ID, base_url: Optional[str] = LLM_URL):
+        """
+        Initialize the content generator with Hugging Face client.
+        
+        Args:
+            model_id: Hugging Face model id or inference endpoint URL
+            base_url: Optional batching inference server URL; overrides model_id
+        """
+        self.model_id = model_id
+        self.endpoint = base_url or model_id
+        self.client = _get_client(self.endpoint)
+        self.async_client = AsyncInferenceClient(self.endpoint, timeout=60)
+        # LRU of key -> (stored_at, result) for repeated identical requests
+        self._response_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self._semantic_cache = (
+            _SemanticCache(
+                SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_ROWS, SEMANTIC_CACHE_THRESHOLD, RESPONSE_CACHE_TTL
+            )
+            if HAS_SENTENCE_TRANSFORMERS
+            and GENERATION_PARAMS["temperature"] <= SEMANTIC_CACHE_MAX_TEMPERATURE
+            else None
+        )
+        # [generations, cache hits]; time and cost saved are derived in calculate_kpis
+        self._stats = array("q", [0, 0])
+        self._stats_lock = threading.Lock()
+        # Read-only view of the last stats snapshot, keyed by the counters it was built from
+        self._stats_view: Tuple[tuple, Mapping[str, Any]] = ((), types.MappingProxyType({}))
     
     def generate_content(
         self, 
         product_data: Dict[str, Any], 
         content_type: str, 
         tone: str, 
-        language: str = "English"
-    ) -> Dict[str, Any]:
+        language: str = "English",
+        stream: bool = False
+    ) -> GenerationResult:
         """
         Generate marketing content for a product.
         
@@ -40,83 +441,493 @@ class ContentGenerator:
             content_type: Type of content to generate
             tone: Tone of voice for the content
             language: Language for the content (English/French)
+            stream: Render tokens into the page as they are decoded
         
         Returns:
-            Dictionary containing generated content and metadata
+            GenerationResult with the generated content and metadata
         """
+        if stream:
+            return self._generate_streamed(product_data, content_type, tone, language)
+        
         try:
-            # Get the appropriate prompt template
-            prompt_template = get_prompt_template(content_type, tone, language)
+            cache_key = self._cache_key(product_data, content_type, tone, language)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
             
-            # Format the prompt with product data
-            prompt = prompt_template.format(
-                product_name=product_data["Product Name"],
-                category=product_data["Category"],
-                features=product_data["Features/Attributes"],
-                target_audience=product_data["Target Audience"]
-            )
+            cached = self._semantic_get(product_data, content_type, tone, language)
+            if cached is not None:
+                return cached
+            
+            prompt = self._build_prompt(product_data, content_type, tone, language)
             
             # Generate content using Mistral 7B
             start_time = time.time()
             
-            with st.spinner("🤖 Generating content with AI..."):
+            used_fallback = False
+            
+            with _st().spinner("🤖 Generating content with AI..."):
                 try:
-                    response = self.client.text_generation(
-                        prompt,
-                        max_new_tokens=300,
-                        temperature=0.7,
-                        do_sample=True,
-                        top_p=0.9
-                    )
+                    response = self.client.text_generation(prompt, **_generation_params(content_type))
                 except StopIteration:
                     # Fallback for when API returns empty response
                     response = self._generate_fallback_content(product_data, content_type, tone, language)
+                    used_fallback = True
                 except Exception as api_error:
-                    st.warning(f"⚠️ API temporarily unavailable. Using fallback content generation.")
+                    _st().warning(f"⚠️ API temporarily unavailable. Using fallback content generation.")
                     response = self._generate_fallback_content(product_data, content_type, tone, language)
+                    used_fallback = True
             
             generation_time = time.time() - start_time
             
-            # Update statistics
-            self.generation_stats["total_generations"] += 1
-            self.generation_stats["total_time_saved"] += 30  # Assume 30 minutes saved per generation
-            self.generation_stats["total_cost_saved"] += 12  # Assume €12 saved per generation
+            result = self._build_result(
+                response, generation_time, product_data, content_type, tone, language, used_fallback
+            )
+            self._cache_put(cache_key, result, product_data)
+            return result
             
-            # Get recommendations
-            recommendations = get_recommendations(content_type, tone)
+        except Exception as e:
+            _st().error(f"❌ Error generating content: {str(e)}")
+            return self._build_error_result(e, product_data, content_type, tone, language)
+    
+    def _generate_streamed(
+        self,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tone: str,
+        language: str
+    ) -> GenerationResult:
+        """Render a token stream into a placeholder, then clear it and return the result."""
+        st = _st()
+        placeholder = st.empty()
+        generation = self.stream_content(product_data, content_type, tone, language)
+        # write_stream appends chunks on the frontend instead of re-sending the text so far
+        with placeholder.container():
+            st.write_stream(iter(generation))
+        placeholder.empty()
+        return generation.result
+    
+    def stream_content(
+        self,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tone: str,
+        language: str = "English"
+    ) -> GenerationStream:
+        """
+        Stream marketing content for a product as the model decodes it.
+        
+        Args:
+            product_data: Dictionary containing product information
+            content_type: Type of content to generate
+            tone: Tone of voice for the content
+            language: Language for the content (English/French)
+        
+        Returns:
+            GenerationStream yielding text chunks; its result is set when exhausted
+        """
+        stream = GenerationStream()
+        stream._chunks = self._stream_chunks(stream, product_data, content_type, tone, language)
+        return stream
+    
+    def _stream_chunks(
+        self,
+        stream: GenerationStream,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tone: str,
+        language: str
+    ) -> Iterator[str]:
+        """Yield tokens from the API and record the packaged result on the stream."""
+        try:
+            cache_key = self._cache_key(product_data, content_type, tone, language)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                stream.result = cached
+                yield cached.content
+                return
             
-            return {
-                "content": response.strip(),
-                "generation_time": generation_time,
-                "recommendations": recommendations,
-                "metadata": {
-                    "product_name": product_data["Product Name"],
-                    "content_type": content_type,
-                    "tone": tone,
-                    "language": language,
-                    "timestamp": time.time()
-                }
-            }
+            cached = self._semantic_get(product_data, content_type, tone, language)
+            if cached is not None:
+                stream.result = cached
+                yield cached.content
+                return
+            
+            prompt = self._build_prompt(product_data, content_type, tone, language)
+            
+            start_time = time.time()
+            used_fallback = False
+            parts = []
+            
+            try:
+                for chunk in self.client.text_generation(prompt, stream=True, **_generation_params(content_type)):
+                    parts.append(chunk)
+                    yield chunk
+            except Exception:
+                # Only fall back if nothing has been shown yet
+                if parts:
+                    raise
+                _st().warning(f"⚠️ API temporarily unavailable. Using fallback content generation.")
+                fallback = self._generate_fallback_content(product_data, content_type, tone, language)
+                used_fallback = True
+                parts.append(fallback)
+                yield fallback
+            
+            generation_time = time.time() - start_time
+            
+            stream.result = self._build_result(
+                "".join(parts), generation_time, product_data, content_type, tone, language, used_fallback
+            )
+            self._cache_put(cache_key, stream.result, product_data)
             
         except Exception as e:
-            st.error(f"❌ Error generating content: {str(e)}")
-            return {
-                "content": "Sorry, there was an error generating content. Please try again.",
-                "generation_time": 0,
-                "recommendations": "Please check your internet connection and try again.",
-                "metadata": {
-                    "product_name": product_data["Product Name"],
+            _st().error(f"❌ Error generating content: {str(e)}")
+            stream.result = self._build_error_result(e, product_data, content_type, tone, language)
+    
+    def generate_many(self, jobs: List[Dict[str, Any]]) -> List[GenerationResult]:
+        """
+        Generate content for several requests concurrently.
+        
+        Args:
+            jobs: List of keyword-argument dictionaries for generate_content
+        
+        Returns:
+            List of GenerationResult, in the same order as jobs
+        """
+        return asyncio.run(self._agenerate_many(jobs))
+    
+    async def _agenerate_many(self, jobs: List[Dict[str, Any]]) -> List[GenerationResult]:
+        """Run all jobs on the async client and wait for every result."""
+        return await asyncio.gather(*[self.generate_content_async(**job) for job in jobs])
+    
+    async def generate_content_async(
+        self,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tone: str,
+        language: str = "English"
+    ) -> GenerationResult:
+        """
+        Generate marketing content for a product without blocking the event loop.
+        
+        Uses AsyncInferenceClient and makes no Streamlit UI calls, so several
+        requests can be awaited together (see generate_many).
+        
+        Args:
+            product_data: Dictionary containing product information
+            content_type: Type of content to generate
+            tone: Tone of voice for the content
+            language: Language for the content (English/French)
+        
+        Returns:
+            GenerationResult with the generated content and metadata
+        """
+        try:
+            cache_key = self._cache_key(product_data, content_type, tone, language)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
+            cached = self._semantic_get(product_data, content_type, tone, language)
+            if cached is not None:
+                return cached
+            
+            prompt = self._build_prompt(product_data, content_type, tone, language)
+            
+            start_time = time.time()
+            
+            used_fallback = False
+            
+            try:
+                response = await self.async_client.text_generation(prompt, **_generation_params(content_type))
+            except Exception:
+                response = self._generate_fallback_content(product_data, content_type, tone, language)
+                used_fallback = True
+            
+            generation_time = time.time() - start_time
+            
+            result = self._build_result(
+                response, generation_time, product_data, content_type, tone, language, used_fallback
+            )
+            self._cache_put(cache_key, result, product_data)
+            return result
+            
+        except Exception as e:
+            return self._build_error_result(e, product_data, content_type, tone, language)
+    
+    def generate_content_multi_tone(
+        self,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tones: List[str],
+        language: str = "English"
+    ) -> Dict[str, GenerationResult]:
+        """
+        Generate one piece of content per tone with as few API calls as possible.
+        
+        The product context is sent once per call and the model is asked for a
+        JSON object keyed by tone. Tones are grouped so no call asks for more
+        than MULTI_TONE_MAX_NEW_TOKENS. Cached tones are served from cache; if a
+        call fails or its response cannot be parsed, a warning is logged and
+        that group's tones go through generate_many instead. Makes no
+        Streamlit UI calls.
+        
+        Args:
+            product_data: Dictionary containing product information
+            content_type: Type of content to generate
+            tones: Tones to generate, in the order results should be returned
+            language: Language for the content (English/French)
+        
+        Returns:
+            Dictionary of tone to GenerationResult, in the order of tones
+        """
+        results: Dict[str, Optional[GenerationResult]] = {}
+        pending = []
+        for tone in tones:
+            results[tone] = self._cache_get(self._cache_key(product_data, content_type, tone, language))
+            if results[tone] is None:
+                pending.append(tone)
+        
+        if not pending:
+            return results
+        
+        budget = TOKEN_BUDGETS.get(content_type, DEFAULT_MAX_NEW_TOKENS)
+        group_size = max(1, MULTI_TONE_MAX_NEW_TOKENS // budget)
+        for i in range(0, len(pending), group_size):
+            group = pending[i:i + group_size]
+            results.update(self._generate_tone_group(product_data, content_type, group, language, budget))
+        return results
+    
+    def _generate_tone_group(
+        self,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tones: List[str],
+        language: str,
+        budget: int
+    ) -> Dict[str, GenerationResult]:
+        """Generate several tones in one call, falling back to one call per tone."""
+        params = {**GENERATION_PARAMS, "max_new_tokens": len(tones) * budget}
+        
+        start_time = time.time()
+        
+        try:
+            response = self.client.text_generation(
+                self._build_multi_tone_prompt(product_data, content_type, tones, language), **params
+            )
+            variants = _parse_tone_variants(response, tones)
+        except Exception as e:
+            logger.warning("Multi-tone generation failed (%s); generating %d tones separately", e, len(tones))
+            variants = None
+        else:
+            if variants is None:
+                logger.warning("Multi-tone response was not valid JSON; generating %d tones separately", len(tones))
+        
+        if variants is None:
+            jobs = [
+                {
+                    "product_data": product_data,
                     "content_type": content_type,
                     "tone": tone,
-                    "language": language,
-                    "timestamp": time.time(),
-                    "error": str(e)
+                    "language": language
                 }
-            }
+                for tone in tones
+            ]
+            return dict(zip(tones, self.generate_many(jobs)))
+        
+        # All variants came from the same call and share its duration
+        generation_time = time.time() - start_time
+        
+        results = {}
+        for tone in tones:
+            result = self._build_result(
+                variants[tone], generation_time, product_data, content_type, tone, language
+            )
+            self._cache_put(
+                self._cache_key(product_data, content_type, tone, language), result, product_data
+            )
+            results[tone] = result
+        return results
+    
+    def _build_multi_tone_prompt(
+        self,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tones: List[str],
+        language: str
+    ) -> str:
+        """Combine each tone's instructions with one shared product block."""
+        product_name, category, features, target_audience = _PRODUCT_FIELDS(product_data)
+        product_block = render_product_fields(
+            language,
+            product_name=product_name,
+            category=category,
+            features=features,
+            target_audience=target_audience
+        )
+        sections = [
+            f"[{tone}]\n{get_instructions(content_type, tone, language)}"
+            for tone in tones
+        ]
+        
+        return "\n\n".join([
+            _MULTI_TONE_INSTRUCTIONS[language].format(content_type=content_type),
+            *sections,
+            product_block,
+            _MULTI_TONE_FORMAT[language].format(tones=json.dumps(tones, ensure_ascii=False))
+        ])
+    
+    def _cache_key(self, product_data: Dict[str, Any], content_type: str, tone: str, language: str) -> str:
+        """Stable digest of everything that determines a generation."""
+        payload = json.dumps([product_data, content_type, tone, language], sort_keys=True, default=str)
+        return hashlib.md5(payload.encode("utf-8")).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[GenerationResult]:
+        """Return a fresh cached result flagged as a cache hit, if any."""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.time() - stored_at > RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+        
+        return self._as_cache_hit(result)
+    
+    def _semantic_get(
+        self,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tone: str,
+        language: str
+    ) -> Optional[GenerationResult]:
+        """Return a cached result for a near-duplicate product, if enabled and found."""
+        if self._semantic_cache is None:
+            return None
+        result = self._semantic_cache.get((content_type, tone, language), _product_text(product_data))
+        return self._as_cache_hit(result) if result is not None else None
     
-    def get_generation_stats(self) -> Dict[str, Any]:
-        """Get current generation statistics."""
-        return self.generation_stats.copy()
+    def _as_cache_hit(self, result: GenerationResult) -> GenerationResult:
+        """Return a stored result marked as served from cache."""
+        with self._stats_lock:
+            self._stats[_STAT_CACHE_HITS] += 1
+        
+        # Results are frozen, so the stored copy is shared rather than deep-copied
+        return dataclasses.replace(
+            result,
+            generation_time=0,
+            metadata=dataclasses.replace(result.metadata, cache_hit=True)
+        )
+    
+    def _cache_put(self, key: str, result: GenerationResult, product_data: Dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        metadata = result.metadata
+        if metadata.error is not None or metadata.fallback:
+            return
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.time(), result)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        
+        if self._semantic_cache is not None:
+            scope = (metadata.content_type, metadata.tone, metadata.language)
+            self._semantic_cache.put(scope, _product_text(product_data), result)
+    
+    def _build_prompt(self, product_data: Dict[str, Any], content_type: str, tone: str, language: str) -> str:
+        """Format the prompt template with product data."""
+        product_name, category, features, target_audience = _PRODUCT_FIELDS(product_data)
+        
+        return render_prompt(
+            content_type,
+            tone,
+            language,
+            product_name=product_name,
+            category=category,
+            features=features,
+            target_audience=target_audience
+        )
+    
+    def _build_result(
+        self,
+        response: str,
+        generation_time: float,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tone: str,
+        language: str,
+        used_fallback: bool = False
+    ) -> GenerationResult:
+        """Record statistics and package a successful generation."""
+        # Update statistics
+        with self._stats_lock:
+            self._stats[_STAT_GENERATIONS] += 1
+        
+        # Get recommendations
+        recommendations = get_recommendations(content_type, tone)
+        
+        return GenerationResult(
+            content=response.strip(),
+            generation_time=generation_time,
+            recommendations=recommendations,
+            metadata=GenerationMetadata(
+                product_name=product_data["Product Name"],
+                content_type=content_type,
+                tone=tone,
+                language=language,
+                timestamp=time.time(),
+                fallback=used_fallback
+            )
+        )
+    
+    def _build_error_result(
+        self,
+        error: Exception,
+        product_data: Dict[str, Any],
+        content_type: str,
+        tone: str,
+        language: str
+    ) -> GenerationResult:
+        """Package a failed generation."""
+        return GenerationResult(
+            content="Sorry, there was an error generating content. Please try again.",
+            generation_time=0,
+            recommendations="Please check your internet connection and try again.",
+            metadata=GenerationMetadata(
+                product_name=product_data["Product Name"],
+                content_type=content_type,
+                tone=tone,
+                language=language,
+                timestamp=time.time(),
+                error=str(error)
+            )
+        )
+    
+    def get_generation_stats(self) -> Mapping[str, Any]:
+        """
+        Get current generation statistics.
+        
+        Returns:
+            Read-only mapping, reused across calls until a counter changes
+        """
+        with self._stats_lock:
+            counters = tuple(self._stats)
+        
+        built_from, view = self._stats_view
+        if built_from == counters:
+            return view
+        
+        generations, cache_hits = counters
+        view = types.MappingProxyType({
+            "total_generations": generations,
+            "total_time_saved": generations * MINUTES_SAVED_PER_GENERATION,  # in minutes
+            "total_cost_saved": generations * EUR_SAVED_PER_GENERATION,  # in EUR
+            "cache_hits": cache_hits
+        })
+        self._stats_view = (counters, view)
+        return view
     
     def calculate_kpis(self) -> Dict[str, Any]:
         """Calculate key performance indicators."""
@@ -142,70 +953,17 @@ class ContentGenerator:
         Returns:
             Fallback content string
         """
-        product_name = product_data["Product Name"]
-        category = product_data["Category"]
-        features = product_data["Features/Attributes"]
-        target_audience = product_data["Target Audience"]
-        
-        # Fallback content templates
-        fallback_templates = {
-            "Product Description": {
-                "Professional": {
-                    "English": f"Introducing {product_name}, a premium {category} designed for {target_audience}. This exceptional product features {features.replace(';', ', ')}. Experience the perfect blend of quality and innovation with {product_name}.",
-                    "French": f"Présentation de {product_name}, un {category} premium conçu pour {target_audience}. Ce produit exceptionnel présente {features.replace(';', ', ')}. Découvrez le parfait équilibre entre qualité et innovation avec {product_name}."
-                },
-                "Playful": {
-                    "English": f"🎉 Meet {product_name} - the {category} that's about to become your new obsession! Perfect for {target_audience}, it's packed with {features.replace(';', ', ')}. Get ready to fall in love! 💕",
-                    "French": f"🎉 Rencontrez {product_name} - le {category} qui va devenir votre nouvelle obsession ! Parfait pour {target_audience}, il est rempli de {features.replace(';', ', ')}. Préparez-vous à tomber amoureux ! 💕"
-                },
-                "Luxury": {
-                    "English": f"Indulge in the exquisite {product_name}, a distinguished {category} crafted for discerning {target_audience}. Featuring {features.replace(';', ', ')}, this masterpiece represents the pinnacle of luxury and sophistication.",
-                    "French": f"Savourez l'exquis {product_name}, un {category} distingué conçu pour {target_audience} exigeants. Avec {features.replace(';', ', ')}, ce chef-d'œuvre représente le summum du luxe et de la sophistication."
-                },
-                "Casual": {
-                    "English": f"Hey there! Check out {product_name} - it's a pretty cool {category} that {target_audience} are going to love. It's got {features.replace(';', ', ')} and honestly, it's just what you need.",
-                    "French": f"Salut ! Découvrez {product_name} - c'est un {category} plutôt cool que {target_audience} vont adorer. Il a {features.replace(';', ', ')} et honnêtement, c'est exactement ce dont vous avez besoin."
-                }
-            },
-            "Social Post": {
-                "Professional": {
-                    "English": f"Discover {product_name} - the {category} solution for {target_audience}. Features include {features.replace(';', ', ')}. #ProductLaunch #Innovation #Quality",
-                    "French": f"Découvrez {product_name} - la solution {category} pour {target_audience}. Caractéristiques : {features.replace(';', ', ')}. #LancementProduit #Innovation #Qualité"
-                },
-                "Playful": {
-                    "English": f"🚀 {product_name} is here and it's AMAZING! Perfect for {target_audience} who want {features.replace(';', ', ')}. Who's excited? 🙋‍♀️ #NewProduct #Excited #MustHave",
-                    "French": f"🚀 {product_name} est là et c'est INCROYABLE ! Parfait pour {target_audience} qui veulent {features.replace(';', ', ')}. Qui est excité ? 🙋‍♀️ #NouveauProduit #Excité #Indispensable"
-                },
-                "Luxury": {
-                    "English": f"Experience the epitome of luxury with {product_name}. This exclusive {category} offers {features.replace(';', ', ')} for the most discerning {target_audience}. #Luxury #Exclusive #Premium",
-                    "French": f"Vivez l'épitomé du luxe avec {product_name}. Ce {category} exclusif offre {features.replace(';', ', ')} pour les {target_audience} les plus exigeants. #Luxe #Exclusif #Premium"
-                },
-                "Casual": {
-                    "English": f"Just tried {product_name} and wow! 😍 Great {category} for {target_audience}. Love that it has {features.replace(';', ', ')}. Highly recommend! #Review #Recommendation",
-                    "French": f"Je viens d'essayer {product_name} et wow ! 😍 Super {category} pour {target_audience}. J'adore qu'il ait {features.replace(';', ', ')}. Je recommande fortement ! #Avis #Recommandation"
-                }
-            },
-            "Email": {
-                "Professional": {
-                    "English": f"Subject: Introducing {product_name} - The {category} Solution You've Been Waiting For\n\nDear Valued Customer,\n\nWe're excited to present {product_name}, a premium {category} designed specifically for {target_audience}. This innovative product features {features.replace(';', ', ')}.\n\nBest regards,\nThe BrandBoost Team",
-                    "French": f"Objet : Présentation de {product_name} - La solution {category} que vous attendiez\n\nCher client,\n\nNous sommes ravis de vous présenter {product_name}, un {category} premium conçu spécifiquement pour {target_audience}. Ce produit innovant présente {features.replace(';', ', ')}.\n\nCordialement,\nL'équipe BrandBoost"
-                },
-                "Playful": {
-                    "English": f"Subject: 🎉 {product_name} is HERE! (And it's amazing!)\n\nHey there!\n\nGuess what? {product_name} just dropped and it's everything {target_audience} have been dreaming of! With {features.replace(';', ', ')}, this {category} is about to change your life! 💫\n\nCheers,\nThe BrandBoost Squad",
-                    "French": f"Objet : 🎉 {product_name} est LÀ ! (Et c'est incroyable !)\n\nSalut !\n\nDevine quoi ? {product_name} vient de sortir et c'est tout ce que {target_audience} rêvaient ! Avec {features.replace(';', ', ')}, ce {category} va changer votre vie ! 💫\n\nSalut,\nL'équipe BrandBoost"
-                },
-                "Luxury": {
-                    "English": f"Subject: Exclusive Invitation: Discover {product_name}\n\nDear Esteemed Client,\n\nWe are honored to invite you to experience {product_name}, our most exclusive {category} offering. Crafted for the discerning {target_audience}, it embodies {features.replace(';', ', ')}.\n\nWarm regards,\nBrandBoost Luxury Division",
-                    "French": f"Objet : Invitation exclusive : Découvrez {product_name}\n\nCher client estimé,\n\nNous avons l'honneur de vous inviter à découvrir {product_name}, notre offre {category} la plus exclusive. Conçu pour les {target_audience} exigeants, il incarne {features.replace(';', ', ')}.\n\nCordialement,\nDivision Luxe BrandBoost"
-                },
-                "Casual": {
-                    "English": f"Subject: You'll love {product_name}!\n\nHi!\n\nJust wanted to share something cool with you - {product_name}! It's this awesome {category} that {target_audience} are totally into. The best part? It comes with {features.replace(';', ', ')}.\n\nTake care,\nThe BrandBoost Team",
-                    "French": f"Objet : Vous allez adorer {product_name} !\n\nSalut !\n\nJe voulais juste partager quelque chose de cool avec toi - {product_name} ! C'est ce {category} génial que {target_audience} adorent. Le meilleur ? Il vient avec {features.replace(';', ', ')}.\n\nÀ bientôt,\nL'équipe BrandBoost"
-                }
-            }
-        }
+        product_name, category, features, target_audience = _PRODUCT_FIELDS(product_data)
         
-        return fallback_templates[content_type][tone][language]
+        return _FALLBACK_TEMPLATES[(content_type, tone, language)].format_map(ChainMap(
+            {
+                "product_name": product_name,
+                "category": category,
+                "features": features.replace(';', ', '),
+                "target_audience": target_audience
+            },
+            _LANG_CONNECTORS[language]
+        ))
 
     def export_content(self, content: str, filename: str = None) -> str:
         """
@@ -222,52 +980,142 @@ class ContentGenerator:
             timestamp = int(time.time())
             filename = f"brandboost_content_{timestamp}.txt"
         
-        # Ensure the reports directory exists
-        os.makedirs("reports", exist_ok=True)
-        
-        filepath = os.path.join("reports", filename)
+        filepath = os.path.join(REPORTS_DIR, filename)
         
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
-            return filepath
+            return _write_report(filepath, content)
         except Exception as e:
-            st.error(f"❌ Error exporting content: {str(e)}")
+            _st().error(f"❌ Error exporting content: {str(e)}")
             return None
 
 
-def load_products(csv_path: str) -> list:
+# Export destination; created on first write rather than on every export
+REPORTS_DIR = "reports"
+_REPORTS_DIR_READY = False
+
+
+def _open_report(tmp_path: str):
+    """Open a report temp file, (re)creating its directory only when needed."""
+    global _REPORTS_DIR_READY
+    if not _REPORTS_DIR_READY:
+        os.makedirs(os.path.dirname(tmp_path), exist_ok=True)
+        _REPORTS_DIR_READY = True
+    try:
+        return open(tmp_path, "w", encoding="utf-8", buffering=1 << 16)
+    except FileNotFoundError:
+        # The directory was removed after it was first created
+        os.makedirs(os.path.dirname(tmp_path), exist_ok=True)
+        return open(tmp_path, "w", encoding="utf-8", buffering=1 << 16)
+
+
+def _write_report(filepath: str, content: str) -> str:
+    """Write content atomically (temp file + rename) and return filepath."""
+    tmp_path = f"{filepath}.{threading.get_ident()}.tmp"
+    try:
+        with _open_report(tmp_path) as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        # Don't leave a partial temp file behind in reports/
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return filepath
+
+
+# Column dtypes for the product catalog CSV
+PRODUCT_DTYPES = {
+    "ProductID": "int32",
+    "Product Name": "string",
+    "Category": "category",
+    "Features/Attributes": "string",
+    "Target Audience": "category"
+}
+
+
+def load_product_catalog(csv_path: str):
     """
-    Load products from CSV file.
+    Load the product catalog as a DataFrame indexed by ProductID.
     
     Args:
         csv_path: Path to the products CSV file
     
     Returns:
-        List of product dictionaries
+        pandas DataFrame indexed by ProductID (empty on error)
     """
     import pandas as pd
     
     try:
-        df = pd.read_csv(csv_path)
-        return df.to_dict("records")
+        df = pd.read_csv(csv_path, dtype=PRODUCT_DTYPES, engine="c", memory_map=True)
+        return df.set_index("ProductID")
     except Exception as e:
-        st.error(f"❌ Error loading products: {str(e)}")
-        return []
+        _st().error(f"❌ Error loading products: {str(e)}")
+        return pd.DataFrame()
+
+
+class ProductCatalog:
+    """
+    Product table with a ProductID index.
+    
+    Iterating yields product dictionaries, so the catalog can be used
+    wherever a list of products was expected.
+    """
+    
+    def __init__(self, df):
+        self.df = df
+        records = df.reset_index().to_dict("records") if not df.empty else []
+        self.index_dict = {product["ProductID"]: product for product in records}
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.index_dict.values())
+    
+    def __len__(self) -> int:
+        return len(self.index_dict)
+    
+    @functools.cached_property
+    def product_options(self) -> Dict[str, int]:
+        """Map selectbox labels to ProductID, built column-wise."""
+        if self.df.empty:
+            return {}
+        labels = self.df["Product Name"] + " (" + self.df["Category"].astype(str) + ")"
+        return dict(zip(labels.tolist(), self.df.index.tolist()))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_catalog_version(csv_path: str, mtime: float) -> ProductCatalog:
+    """Parse a catalog once per file version; mtime is part of the cache key."""
+    return ProductCatalog(load_product_catalog(csv_path))
+
+
+def load_products(csv_path: str) -> ProductCatalog:
+    """
+    Load products from CSV file.
+    
+    Args:
+        csv_path: Path to the products CSV file
+    
+    Returns:
+        ProductCatalog, shared between calls until the file changes
+    """
+    try:
+        mtime = os.path.getmtime(csv_path)
+    except OSError:
+        # Let load_product_catalog report the error; don't cache the failure
+        return ProductCatalog(load_product_catalog(csv_path))
+    return _load_catalog_version(csv_path, mtime)
 
 
-def get_product_by_id(products: list, product_id: int) -> Optional[Dict[str, Any]]:
+def get_product_by_id(products: ProductCatalog, product_id: int) -> Optional[Dict[str, Any]]:
     """
     Get a specific product by its ID.
     
     Args:
-        products: List of product dictionaries
+        products: Catalog returned by load_products
         product_id: The ID of the product to find
     
     Returns:
         Product dictionary or None if not found
     """
-    for product in products:
-        if product["ProductID"] == product_id:
-            return product
-    return None
+    return products.index_dict.get(product_id)
@@ -2,6 +2,337 @@
 Prompt templates for different content types and tones.
 """
 
+import string
+import sys
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Supported options, in display order
+CONTENT_TYPES = ["Product Description", "Social Post", "Email"]
+TONES = ["Professional", "Playful", "Luxury", "Casual"]
+LANGUAGES = ["English", "French"]
+
+
+# Shared prompt scaffolding. Lines keep the 16-space continuation indent the
+# templates were originally written with; blank separator lines are bare.
+_LINE = "\n" + " " * 16
+_REQUIREMENTS_HEADER = {"English": "Requirements:", "French": "Exigences:"}
+_PRODUCT_FIELD_LINES = {
+    "English": _LINE.join([
+        "Product: {product_name}",
+        "Category: {category}",
+        "Key features: {features}",
+        "Target audience: {target_audience}"
+    ]),
+    "French": _LINE.join([
+        "Produit: {product_name}",
+        "Catégorie: {category}",
+        "Caractéristiques clés: {features}",
+        "Public cible: {target_audience}"
+    ])
+}
+
+# (intro, requirements) keyed by (content_type, tone, language)
+_TEMPLATE_PARTS: Dict[Tuple[str, str, str], Tuple[str, Tuple[str, ...]]] = {
+    ("Product Description", "Professional", "English"): (
+        "Write a professional product description for the product below.",
+        (
+            "Professional, informative tone",
+            "Highlight key features and benefits",
+            "Include SEO-friendly keywords",
+            "150-200 words",
+            "Focus on value proposition and quality"
+        )
+    ),
+    ("Product Description", "Professional", "French"): (
+        "Écrivez une description de produit professionnelle pour le produit ci-dessous.",
+        (
+            "Ton professionnel et informatif",
+            "Mettre en avant les caractéristiques et avantages clés",
+            "Inclure des mots-clés SEO",
+            "150-200 mots",
+            "Se concentrer sur la proposition de valeur et la qualité"
+        )
+    ),
+    ("Product Description", "Playful", "English"): (
+        "Write a playful and engaging product description for the product below.",
+        (
+            "Fun, energetic tone with personality",
+            "Use creative language and emojis",
+            "Make it shareable and memorable",
+            "120-180 words",
+            "Focus on excitement and user experience"
+        )
+    ),
+    ("Product Description", "Playful", "French"): (
+        "Écrivez une description de produit ludique et engageante pour le produit ci-dessous.",
+        (
+            "Ton amusant et énergique avec de la personnalité",
+            "Utiliser un langage créatif et des emojis",
+            "Rendre partageable et mémorable",
+            "120-180 mots",
+            "Se concentrer sur l'excitation et l'expérience utilisateur"
+        )
+    ),
+    ("Product Description", "Luxury", "English"): (
+        "Write a sophisticated luxury product description for the product below.",
+        (
+            "Elegant, premium tone",
+            "Emphasize exclusivity and craftsmanship",
+            "Use refined vocabulary",
+            "180-220 words",
+            "Focus on quality, prestige, and sophistication"
+        )
+    ),
+    ("Product Description", "Luxury", "French"): (
+        "Écrivez une description de produit de luxe sophistiquée pour le produit ci-dessous.",
+        (
+            "Ton élégant et premium",
+            "Souligner l'exclusivité et l'artisanat",
+            "Utiliser un vocabulaire raffiné",
+            "180-220 mots",
+            "Se concentrer sur la qualité, le prestige et la sophistication"
+        )
+    ),
+    ("Product Description", "Casual", "English"): (
+        "Write a casual, friendly product description for the product below.",
+        (
+            "Conversational, approachable tone",
+            "Use everyday language",
+            "Be relatable and down-to-earth",
+            "130-170 words",
+            "Focus on practical benefits and ease of use"
+        )
+    ),
+    ("Product Description", "Casual", "French"): (
+        "Écrivez une description de produit décontractée et amicale pour le produit ci-dessous.",
+        (
+            "Ton conversationnel et accessible",
+            "Utiliser un langage quotidien",
+            "Être relatable et terre-à-terre",
+            "130-170 mots",
+            "Se concentrer sur les avantages pratiques et la facilité d'utilisation"
+        )
+    ),
+    ("Social Post", "Professional", "English"): (
+        "Create a professional social media post for the product below.",
+        (
+            "Professional yet engaging tone",
+            "Include relevant hashtags",
+            "Call-to-action",
+            "100-150 words",
+            "Platform-agnostic (works for LinkedIn, Facebook, Twitter)"
+        )
+    ),
+    ("Social Post", "Professional", "French"): (
+        "Créez un post de médias sociaux professionnel pour le produit ci-dessous.",
+        (
+            "Ton professionnel mais engageant",
+            "Inclure des hashtags pertinents",
+            "Appel à l'action",
+            "100-150 mots",
+            "Indépendant de la plateforme (fonctionne pour LinkedIn, Facebook, Twitter)"
+        )
+    ),
+    ("Social Post", "Playful", "English"): (
+        "Create a fun, engaging social media post for the product below.",
+        (
+            "Playful, energetic tone with emojis",
+            "Creative hashtags",
+            "Strong call-to-action",
+            "80-120 words",
+            "Highly shareable content"
+        )
+    ),
+    ("Social Post", "Playful", "French"): (
+        "Créez un post de médias sociaux amusant et engageant pour le produit ci-dessous.",
+        (
+            "Ton ludique et énergique avec des emojis",
+            "Hashtags créatifs",
+            "Appel à l'action fort",
+            "80-120 mots",
+            "Contenu hautement partageable"
+        )
+    ),
+    ("Social Post", "Luxury", "English"): (
+        "Create a sophisticated luxury social media post for the product below.",
+        (
+            "Elegant, aspirational tone",
+            "Premium hashtags",
+            "Exclusive feel",
+            "100-140 words",
+            "Focus on exclusivity and quality"
+        )
+    ),
+    ("Social Post", "Luxury", "French"): (
+        "Créez un post de médias sociaux de luxe sophistiqué pour le produit ci-dessous.",
+        (
+            "Ton élégant et inspirant",
+            "Hashtags premium",
+            "Sentiment d'exclusivité",
+            "100-140 mots",
+            "Se concentrer sur l'exclusivité et la qualité"
+        )
+    ),
+    ("Social Post", "Casual", "English"): (
+        "Create a casual, relatable social media post for the product below.",
+        (
+            "Conversational, friendly tone",
+            "Relatable hashtags",
+            "Easy-going call-to-action",
+            "90-130 words",
+            "Authentic and approachable"
+        )
+    ),
+    ("Social Post", "Casual", "French"): (
+        "Créez un post de médias sociaux décontracté et relatable pour le produit ci-dessous.",
+        (
+            "Ton conversationnel et amical",
+            "Hashtags relatables",
+            "Appel à l'action décontracté",
+            "90-130 mots",
+            "Authentique et accessible"
+        )
+    ),
+    ("Email", "Professional", "English"): (
+        "Write a professional email marketing content for the product below.",
+        (
+            "Professional, trustworthy tone",
+            "Clear subject line suggestion",
+            "Compelling body content",
+            "Strong call-to-action",
+            "200-300 words",
+            "Focus on benefits and value"
+        )
+    ),
+    ("Email", "Professional", "French"): (
+        "Écrivez un contenu d'email marketing professionnel pour le produit ci-dessous.",
+        (
+            "Ton professionnel et digne de confiance",
+            "Suggestion d'objet claire",
+            "Contenu de corps convaincant",
+            "Appel à l'action fort",
+            "200-300 mots",
+            "Se concentrer sur les avantages et la valeur"
+        )
+    ),
+    ("Email", "Playful", "English"): (
+        "Write a fun, engaging email marketing content for the product below.",
+        (
+            "Energetic, fun tone",
+            "Creative subject line",
+            "Engaging storytelling",
+            "Exciting call-to-action",
+            "180-250 words",
+            "Focus on excitement and engagement"
+        )
+    ),
+    ("Email", "Playful", "French"): (
+        "Écrivez un contenu d'email marketing amusant et engageant pour le produit ci-dessous.",
+        (
+            "Ton énergique et amusant",
+            "Objet créatif",
+            "Storytelling engageant",
+            "Appel à l'action excitant",
+            "180-250 mots",
+            "Se concentrer sur l'excitation et l'engagement"
+        )
+    ),
+    ("Email", "Luxury", "English"): (
+        "Write a sophisticated luxury email marketing content for the product below.",
+        (
+            "Elegant, premium tone",
+            "Exclusive subject line",
+            "Sophisticated language",
+            "Refined call-to-action",
+            "220-320 words",
+            "Focus on exclusivity and prestige"
+        )
+    ),
+    ("Email", "Luxury", "French"): (
+        "Écrivez un contenu d'email marketing de luxe sophistiqué pour le produit ci-dessous.",
+        (
+            "Ton élégant et premium",
+            "Objet exclusif",
+            "Langage sophistiqué",
+            "Appel à l'action raffiné",
+            "220-320 mots",
+            "Se concentrer sur l'exclusivité et le prestige"
+        )
+    ),
+    ("Email", "Casual", "English"): (
+        "Write a casual, friendly email marketing content for the product below.",
+        (
+            "Conversational, approachable tone",
+            "Friendly subject line",
+            "Personal touch",
+            "Easy-going call-to-action",
+            "190-280 words",
+            "Focus on relatability and ease"
+        )
+    ),
+    ("Email", "Casual", "French"): (
+        "Écrivez un contenu d'email marketing décontracté et amical pour le produit ci-dessous.",
+        (
+            "Ton conversationnel et accessible",
+            "Objet amical",
+            "Touche personnelle",
+            "Appel à l'action décontracté",
+            "190-280 mots",
+            "Se concentrer sur la relatabilité et la facilité"
+        )
+    )
+}
+
+
+def _compose_instructions(intro: str, requirements: Tuple[str, ...], language: str) -> str:
+    """Assemble intro and requirement bullets into a template's instruction block."""
+    bullets = "".join(f"{_LINE}- {requirement}" for requirement in requirements)
+    return sys.intern(f"{intro}\n{_LINE}{_REQUIREMENTS_HEADER[language]}{bullets}")
+
+
+# Instruction blocks (everything before the product fields) keyed by
+# (content_type, tone, language)
+_INSTRUCTIONS: Dict[Tuple[str, str, str], str] = {
+    key: _compose_instructions(intro, requirements, key[2])
+    for key, (intro, requirements) in _TEMPLATE_PARTS.items()
+}
+
+# Prompt templates keyed by (content_type, tone, language), built once at import
+_TEMPLATES: Dict[Tuple[str, str, str], str] = {
+    key: sys.intern(f"{instructions}\n{_LINE}{_PRODUCT_FIELD_LINES[key[2]]}")
+    for key, instructions in _INSTRUCTIONS.items()
+}
+
+# Recommendation text keyed by (content_type, tone)
+_RECOMMENDATIONS: Dict[Tuple[str, str], str] = {
+    ("Product Description", "Professional"):
+        "Professional tone is recommended for product pages to boost SEO and build credibility with customers.",
+    ("Product Description", "Playful"):
+        "Playful tone works great for lifestyle products and social media integration to increase engagement.",
+    ("Product Description", "Luxury"):
+        "Luxury tone is perfect for premium products to justify higher prices and attract affluent customers.",
+    ("Product Description", "Casual"):
+        "Casual tone helps make products more approachable and relatable to everyday consumers.",
+    ("Social Post", "Professional"):
+        "Professional tone is ideal for LinkedIn and B2B platforms to maintain brand authority.",
+    ("Social Post", "Playful"):
+        "Playful tone is best for social media campaigns to increase engagement and shareability.",
+    ("Social Post", "Luxury"):
+        "Luxury tone creates aspirational content that drives premium brand perception.",
+    ("Social Post", "Casual"):
+        "Casual tone builds authentic connections and encourages user-generated content.",
+    ("Email", "Professional"):
+        "Professional tone builds trust and is perfect for transactional and informational emails.",
+    ("Email", "Playful"):
+        "Playful tone increases open rates and engagement in promotional campaigns.",
+    ("Email", "Luxury"):
+        "Luxury tone creates exclusivity and drives high-value customer actions.",
+    ("Email", "Casual"):
+        "Casual tone improves deliverability and creates personal connections with subscribers."
+}
+_RECOMMENDATIONS = {key: sys.intern(text) for key, text in _RECOMMENDATIONS.items()}
+
+
 def get_prompt_template(content_type: str, tone: str, language: str = "English") -> str:
     """
     Get the appropriate prompt template based on content type, tone, and language.
@@ -14,313 +345,7 @@ def get_prompt_template(content_type: str, tone: str, language: str = "English")
     Returns:
         Formatted prompt template string
     """
-    
-    # Base templates for different content types
-    templates = {
-        "Product Description": {
-            "Professional": {
-                "English": """Write a professional product description for {product_name} in the {category} category. 
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Professional, informative tone
-                - Highlight key features and benefits
-                - Include SEO-friendly keywords
-                - 150-200 words
-                - Focus on value proposition and quality""",
-                
-                "French": """Écrivez une description de produit professionnelle pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton professionnel et informatif
-                - Mettre en avant les caractéristiques et avantages clés
-                - Inclure des mots-clés SEO
-                - 150-200 mots
-                - Se concentrer sur la proposition de valeur et la qualité"""
-            },
-            
-            "Playful": {
-                "English": """Write a playful and engaging product description for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Fun, energetic tone with personality
-                - Use creative language and emojis
-                - Make it shareable and memorable
-                - 120-180 words
-                - Focus on excitement and user experience""",
-                
-                "French": """Écrivez une description de produit ludique et engageante pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton amusant et énergique avec de la personnalité
-                - Utiliser un langage créatif et des emojis
-                - Rendre partageable et mémorable
-                - 120-180 mots
-                - Se concentrer sur l'excitation et l'expérience utilisateur"""
-            },
-            
-            "Luxury": {
-                "English": """Write a sophisticated luxury product description for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Elegant, premium tone
-                - Emphasize exclusivity and craftsmanship
-                - Use refined vocabulary
-                - 180-220 words
-                - Focus on quality, prestige, and sophistication""",
-                
-                "French": """Écrivez une description de produit de luxe sophistiquée pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton élégant et premium
-                - Souligner l'exclusivité et l'artisanat
-                - Utiliser un vocabulaire raffiné
-                - 180-220 mots
-                - Se concentrer sur la qualité, le prestige et la sophistication"""
-            },
-            
-            "Casual": {
-                "English": """Write a casual, friendly product description for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Conversational, approachable tone
-                - Use everyday language
-                - Be relatable and down-to-earth
-                - 130-170 words
-                - Focus on practical benefits and ease of use""",
-                
-                "French": """Écrivez une description de produit décontractée et amicale pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton conversationnel et accessible
-                - Utiliser un langage quotidien
-                - Être relatable et terre-à-terre
-                - 130-170 mots
-                - Se concentrer sur les avantages pratiques et la facilité d'utilisation"""
-            }
-        },
-        
-        "Social Post": {
-            "Professional": {
-                "English": """Create a professional social media post for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Professional yet engaging tone
-                - Include relevant hashtags
-                - Call-to-action
-                - 100-150 words
-                - Platform-agnostic (works for LinkedIn, Facebook, Twitter)""",
-                
-                "French": """Créez un post de médias sociaux professionnel pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton professionnel mais engageant
-                - Inclure des hashtags pertinents
-                - Appel à l'action
-                - 100-150 mots
-                - Indépendant de la plateforme (fonctionne pour LinkedIn, Facebook, Twitter)"""
-            },
-            
-            "Playful": {
-                "English": """Create a fun, engaging social media post for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Playful, energetic tone with emojis
-                - Creative hashtags
-                - Strong call-to-action
-                - 80-120 words
-                - Highly shareable content""",
-                
-                "French": """Créez un post de médias sociaux amusant et engageant pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton ludique et énergique avec des emojis
-                - Hashtags créatifs
-                - Appel à l'action fort
-                - 80-120 mots
-                - Contenu hautement partageable"""
-            },
-            
-            "Luxury": {
-                "English": """Create a sophisticated luxury social media post for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Elegant, aspirational tone
-                - Premium hashtags
-                - Exclusive feel
-                - 100-140 words
-                - Focus on exclusivity and quality""",
-                
-                "French": """Créez un post de médias sociaux de luxe sophistiqué pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton élégant et inspirant
-                - Hashtags premium
-                - Sentiment d'exclusivité
-                - 100-140 mots
-                - Se concentrer sur l'exclusivité et la qualité"""
-            },
-            
-            "Casual": {
-                "English": """Create a casual, relatable social media post for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Conversational, friendly tone
-                - Relatable hashtags
-                - Easy-going call-to-action
-                - 90-130 words
-                - Authentic and approachable""",
-                
-                "French": """Créez un post de médias sociaux décontracté et relatable pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton conversationnel et amical
-                - Hashtags relatables
-                - Appel à l'action décontracté
-                - 90-130 mots
-                - Authentique et accessible"""
-            }
-        },
-        
-        "Email": {
-            "Professional": {
-                "English": """Write a professional email marketing content for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Professional, trustworthy tone
-                - Clear subject line suggestion
-                - Compelling body content
-                - Strong call-to-action
-                - 200-300 words
-                - Focus on benefits and value""",
-                
-                "French": """Écrivez un contenu d'email marketing professionnel pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton professionnel et digne de confiance
-                - Suggestion d'objet claire
-                - Contenu de corps convaincant
-                - Appel à l'action fort
-                - 200-300 mots
-                - Se concentrer sur les avantages et la valeur"""
-            },
-            
-            "Playful": {
-                "English": """Write a fun, engaging email marketing content for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Energetic, fun tone
-                - Creative subject line
-                - Engaging storytelling
-                - Exciting call-to-action
-                - 180-250 words
-                - Focus on excitement and engagement""",
-                
-                "French": """Écrivez un contenu d'email marketing amusant et engageant pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton énergique et amusant
-                - Objet créatif
-                - Storytelling engageant
-                - Appel à l'action excitant
-                - 180-250 mots
-                - Se concentrer sur l'excitation et l'engagement"""
-            },
-            
-            "Luxury": {
-                "English": """Write a sophisticated luxury email marketing content for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Elegant, premium tone
-                - Exclusive subject line
-                - Sophisticated language
-                - Refined call-to-action
-                - 220-320 words
-                - Focus on exclusivity and prestige""",
-                
-                "French": """Écrivez un contenu d'email marketing de luxe sophistiqué pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton élégant et premium
-                - Objet exclusif
-                - Langage sophistiqué
-                - Appel à l'action raffiné
-                - 220-320 mots
-                - Se concentrer sur l'exclusivité et le prestige"""
-            },
-            
-            "Casual": {
-                "English": """Write a casual, friendly email marketing content for {product_name} in the {category} category.
-                Key features: {features}
-                Target audience: {target_audience}
-                
-                Requirements:
-                - Conversational, approachable tone
-                - Friendly subject line
-                - Personal touch
-                - Easy-going call-to-action
-                - 190-280 words
-                - Focus on relatability and ease""",
-                
-                "French": """Écrivez un contenu d'email marketing décontracté et amical pour {product_name} dans la catégorie {category}.
-                Caractéristiques clés: {features}
-                Public cible: {target_audience}
-                
-                Exigences:
-                - Ton conversationnel et accessible
-                - Objet amical
-                - Touche personnelle
-                - Appel à l'action décontracté
-                - 190-280 mots
-                - Se concentrer sur la relatabilité et la facilité"""
-            }
-        }
-    }
-    
-    return templates[content_type][tone][language]
+    return _TEMPLATES[(content_type, tone, language)]
 
 
 def get_recommendations(content_type: str, tone: str) -> str:
@@ -334,25 +359,103 @@ def get_recommendations(content_type: str, tone: str) -> str:
     Returns:
         Recommendation string
     """
-    recommendations = {
-        "Product Description": {
-            "Professional": "Professional tone is recommended for product pages to boost SEO and build credibility with customers.",
-            "Playful": "Playful tone works great for lifestyle products and social media integration to increase engagement.",
-            "Luxury": "Luxury tone is perfect for premium products to justify higher prices and attract affluent customers.",
-            "Casual": "Casual tone helps make products more approachable and relatable to everyday consumers."
-        },
-        "Social Post": {
-            "Professional": "Professional tone is ideal for LinkedIn and B2B platforms to maintain brand authority.",
-            "Playful": "Playful tone is best for social media campaigns to increase engagement and shareability.",
-            "Luxury": "Luxury tone creates aspirational content that drives premium brand perception.",
-            "Casual": "Casual tone builds authentic connections and encourages user-generated content."
-        },
-        "Email": {
-            "Professional": "Professional tone builds trust and is perfect for transactional and informational emails.",
-            "Playful": "Playful tone increases open rates and engagement in promotional campaigns.",
-            "Luxury": "Luxury tone creates exclusivity and drives high-value customer actions.",
-            "Casual": "Casual tone improves deliverability and creates personal connections with subscribers."
-        }
-    }
+    return _RECOMMENDATIONS[(content_type, tone)]
+
+
+# A template split into (literal_text, field_name) pairs; field_name is None
+# for trailing literal text
+CompiledTemplate = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def compile_template(template: str) -> CompiledTemplate:
+    """
+    Parse a prompt template once into literal chunks and field names.
+    
+    Args:
+        template: Template string with {field} placeholders
+    
+    Returns:
+        Tuple of (literal_text, field_name) pairs for format_prompt
+    """
+    return tuple(
+        (literal, field_name)
+        for literal, field_name, _, _ in string.Formatter().parse(template)
+    )
+
+
+def format_prompt(compiled: CompiledTemplate, values: Mapping[str, Any]) -> str:
+    """
+    Fill a compiled template without re-parsing the format string.
+    
+    Args:
+        compiled: Result of compile_template
+        values: Mapping from field name to value
+    
+    Returns:
+        Formatted prompt string
+    """
+    return "".join([
+        literal if field_name is None else literal + str(values[field_name])
+        for literal, field_name in compiled
+    ])
+
+
+# Every template parsed once at import. The first literal chunk of each is its
+# static instruction block, so prompts for the same content type, tone and
+# language share a byte-identical prefix that TGI / vLLM prefix caching can
+# reuse. The prefixes are short (~100 tokens): block-level caches like vLLM's
+# hit, but providers that only cache prompts of 1024+ tokens will not.
+_COMPILED_TEMPLATES: Dict[Tuple[str, str, str], CompiledTemplate] = {
+    key: compile_template(template) for key, template in _TEMPLATES.items()
+}
+
+
+# Product field section of every template, per language
+_COMPILED_PRODUCT_FIELDS: Dict[str, CompiledTemplate] = {
+    language: compile_template(lines) for language, lines in _PRODUCT_FIELD_LINES.items()
+}
+
+
+def get_instructions(content_type: str, tone: str, language: str = "English") -> str:
+    """
+    Get the instruction block of a prompt template, without the product fields.
+    
+    Args:
+        content_type: Type of content (Product Description, Social Post, Email)
+        tone: Tone of voice (Professional, Playful, Luxury, Casual)
+        language: Language (English or French)
+    
+    Returns:
+        Intro and requirements text
+    """
+    return _INSTRUCTIONS[(content_type, tone, language)]
+
+
+def render_product_fields(language: str = "English", **context: Any) -> str:
+    """
+    Fill the product field section shared by every template of a language.
     
-    return recommendations[content_type][tone]
+    Args:
+        language: Language (English or French)
+        **context: product_name, category, features and target_audience
+    
+    Returns:
+        Product field lines, as they appear at the end of a prompt
+    """
+    return format_prompt(_COMPILED_PRODUCT_FIELDS[language], context)
+
+
+def render_prompt(content_type: str, tone: str, language: str = "English", **context: Any) -> str:
+    """
+    Fill a prompt template with product fields.
+    
+    Args:
+        content_type: Type of content (Product Description, Social Post, Email)
+        tone: Tone of voice (Professional, Playful, Luxury, Casual)
+        language: Language (English or French)
+        **context: product_name, category, features and target_audience
+    
+    Returns:
+        Ready-to-send prompt string
+    """
+    return format_prompt(_COMPILED_TEMPLATES[(content_type, tone, language)], context)